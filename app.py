@@ -1,10 +1,9 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from streamlit_option_menu import option_menu
 import os
+import threading
+from collections import namedtuple
 from datetime import datetime, timedelta
 
 # Import custom modules
@@ -13,48 +12,147 @@ from services.weather_service import WeatherService
 from services.recommendation_engine import RecommendationEngine
 from utils.data_processor import DataProcessor
 
+# Nutrients shown on the soil analysis chart and their optimal levels (ppm)
+NUTRIENTS = np.array(['Nitrogen', 'Phosphorus', 'Potassium', 'Calcium', 'Magnesium'])
+OPTIMAL_NUTRIENTS = np.array([40, 30, 200, 2000, 200], dtype=np.int16)
+
+# Supported crops and dashboard regions
+CROPS = ('Wheat', 'Corn', 'Rice', 'Soybeans')
+REGIONS = ('North America', 'Europe', 'Asia', 'South America', 'Africa')
+
+# Month-end dates covered by the dashboard yield trends
+DASHBOARD_DATES = pd.date_range(start='2020-01-01', end='2024-12-31', freq='ME', name='Date')
+
+# Navigation pages and the icon shown next to each
+NAV_OPTIONS = ("Dashboard", "Yield Prediction", "Weather Monitoring", "Soil Analysis", "Recommendations")
+NAV_ICONS = {
+    "Dashboard": "📊",
+    "Yield Prediction": "🔮",
+    "Weather Monitoring": "🌤️",
+    "Soil Analysis": "🌱",
+    "Recommendations": "💡"
+}
+
+# Streamlit banner used to show each prediction risk level
+RISK_BANNERS = {'Low': 'success', 'Medium': 'warning', 'High': 'error'}
+
+# Seed for the synthetic dashboard data, matching the training data seed
+DASHBOARD_SEED = 42
+
+# Series longer than this are LTTB-downsampled before plotting
+MAX_CHART_POINTS = 2000
+
+# Charts with at least this many points fall back from unified hover
+UNIFIED_HOVER_MAX_POINTS = 5000
+
+def downsample_series(series, max_points=MAX_CHART_POINTS):
+    """
+    Downsample a time-indexed series with Largest-Triangle-Three-Buckets
+
+    Args:
+        series (pandas.Series): Values indexed by a DatetimeIndex
+        max_points (int): Maximum number of points to keep
+
+    Returns:
+        pandas.Series: The series itself if short enough, otherwise the
+        subset of points that best preserves its visual shape
+    """
+    n = len(series)
+    if n <= max_points or max_points < 3:
+        return series
+
+    x = series.index.asi8.astype(np.float64)
+    y = series.to_numpy(dtype=np.float64)
+
+    # First and last points are always kept; the rest are split into buckets
+    buckets = np.array_split(np.arange(1, n - 1), max_points - 2)
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    anchor = 0
+    for i, bucket in enumerate(buckets):
+        next_bucket = buckets[i + 1] if i + 1 < len(buckets) else selected[-1:]
+        avg_x, avg_y = x[next_bucket].mean(), y[next_bucket].mean()
+
+        # Pick the point forming the largest triangle with the previous pick
+        # and the average of the next bucket
+        areas = np.abs(
+            (x[anchor] - avg_x) * (y[bucket] - y[anchor])
+            - (x[anchor] - x[bucket]) * (avg_y - y[anchor])
+        )
+        anchor = bucket[np.argmax(areas)]
+        selected[i + 1] = anchor
+
+    return series.iloc[selected]
+
+class LazyService:
+    """Proxy that constructs the wrapped service on first attribute access"""
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._instance = None
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self._factory()
+        return getattr(self._instance, name)
+
+# Shared services, accessed by name so pages only touch what they use
+Services = namedtuple('Services', ['weather', 'data', 'predictor', 'recommendations'])
+
 # Initialize services
 @st.cache_resource
 def initialize_services():
     weather_service = WeatherService()
     data_processor = DataProcessor()
-    crop_predictor = CropYieldPredictor()
-    recommendation_engine = RecommendationEngine()
-    return weather_service, data_processor, crop_predictor, recommendation_engine
+    # Model training and the recommendation knowledge base are only built
+    # once a page actually uses them
+    crop_predictor = LazyService(CropYieldPredictor)
+    recommendation_engine = LazyService(RecommendationEngine)
+    return Services(weather_service, data_processor, crop_predictor, recommendation_engine)
+
+# Repeat predictions for the same inputs are served from the cache; the
+# inputs come in as a sorted tuple of (name, value) pairs so they hash
+@st.cache_data(max_entries=256, show_spinner=False)
+def predict_crop_yield(_crop_predictor, input_items):
+    return _crop_predictor.predict_yield(dict(input_items))
 
 def main():
-    st.set_page_config(
-        page_title="AI Crop Yield Prediction Platform",
-        page_icon="🌾",
-        layout="wide"
-    )
+    # Page config only needs to be sent once per session
+    if '_page_configured' not in st.session_state:
+        st.set_page_config(
+            page_title="AI Crop Yield Prediction Platform",
+            page_icon="🌾",
+            layout="wide"
+        )
+        st.session_state['_page_configured'] = True
 
     # Initialize services
-    weather_service, data_processor, crop_predictor, recommendation_engine = initialize_services()
+    services = initialize_services()
 
     st.title("🌾 AI Crop Yield Prediction Platform")
     st.markdown("**Advanced agricultural intelligence for optimal farming decisions**")
 
     # Navigation menu
-    selected = option_menu(
-        menu_title=None,
-        options=["Dashboard", "Yield Prediction", "Weather Monitoring", "Soil Analysis", "Recommendations"],
-        icons=['house', 'graph-up', 'cloud-sun', 'geo-alt', 'lightbulb'],
-        menu_icon="cast",
-        default_index=0,
-        orientation="horizontal"
+    selected = st.radio(
+        "Navigation",
+        options=NAV_OPTIONS,
+        format_func=lambda page: f"{NAV_ICONS[page]} {page}",
+        horizontal=True,
+        label_visibility="collapsed"
     )
 
-    if selected == "Dashboard":
-        show_dashboard(weather_service, data_processor)
-    elif selected == "Yield Prediction":
-        show_prediction_page(crop_predictor, weather_service)
-    elif selected == "Weather Monitoring":
-        show_weather_page(weather_service)
-    elif selected == "Soil Analysis":
-        show_soil_analysis_page(data_processor)
-    elif selected == "Recommendations":
-        show_recommendations_page(recommendation_engine)
+    pages = {
+        "Dashboard": lambda: show_dashboard(services.weather, services.data),
+        "Yield Prediction": lambda: show_prediction_page(services.predictor, services.weather),
+        "Weather Monitoring": lambda: show_weather_page(services.weather),
+        "Soil Analysis": lambda: show_soil_analysis_page(services.data),
+        "Recommendations": lambda: show_recommendations_page(services.recommendations)
+    }
+    pages[selected]()
 
 def show_dashboard(weather_service, data_processor):
     st.header("📊 Dashboard")
@@ -92,170 +190,281 @@ def show_dashboard(weather_service, data_processor):
     # Sample yield trends visualization
     st.subheader("📈 Yield Trends")
 
-    # Generate sample trend data
-    dates = pd.date_range(start='2020-01-01', end='2024-12-31', freq='ME')
-    crops = ['Wheat', 'Corn', 'Rice', 'Soybeans']
-
-    trend_data = []
-    for crop in crops:
-        base_yield = np.random.uniform(3, 8)
-        trend = np.random.uniform(-0.1, 0.3, len(dates))
-        noise = np.random.normal(0, 0.5, len(dates))
-        yields = base_yield + np.cumsum(trend) + noise
-        yields = np.maximum(yields, 0.5)  # Ensure positive yields
-
-        for i, date in enumerate(dates):
-            trend_data.append({
-                'Date': date,
-                'Crop': crop,
-                'Yield': yields[i]
-            })
-
-    trend_df = pd.DataFrame(trend_data)
+    fig, fig_bar, fig_pie = build_dashboard_figures()
+
+    st.plotly_chart(fig, use_container_width=True)
+
+    # Regional performance
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.subheader("🌍 Regional Performance")
+        st.plotly_chart(fig_bar, use_container_width=True)
+
+    with col2:
+        st.subheader("🌾 Crop Distribution")
+        st.plotly_chart(fig_pie, use_container_width=True)
+
+@st.cache_data
+def get_dashboard_data(seed=DASHBOARD_SEED):
+    """Generate the synthetic dashboard datasets (cached across reruns)"""
+    rng = np.random.default_rng(seed)
 
+    # Generate sample trend data
+    dates = DASHBOARD_DATES
+    crops = CROPS
+
+    # Build all crop series at once: one column per crop, one row per month
+    base_yields = rng.uniform(3, 8, len(crops))
+    trend = rng.uniform(-0.1, 0.3, (len(dates), len(crops)))
+    noise = rng.normal(0, 0.5, (len(dates), len(crops)))
+    yields = np.maximum(base_yields + np.cumsum(trend, axis=0) + noise, 0.5)  # Ensure positive yields
+    # Chart data only needs single precision; float32 halves the figure payload
+    yields = yields.astype(np.float32, copy=False)
+
+    # Keep the dates as a DatetimeIndex rather than materializing a column
+    trend_wide = pd.DataFrame(yields, index=dates, columns=crops)
+    if len(trend_wide) > MAX_CHART_POINTS:
+        # Each crop keeps its own LTTB points, so downsample before going long
+        trend_df = pd.concat([
+            downsample_series(trend_wide[crop]).to_frame('Yield').assign(Crop=crop)
+            for crop in crops
+        ])
+    else:
+        trend_df = trend_wide.melt(var_name='Crop', value_name='Yield', ignore_index=False)
+
+    regions = REGIONS
+    avg_yields = rng.uniform(4, 9, len(regions)).astype(np.float32, copy=False)
+
+    crop_areas = np.array([25, 30, 20, 25], dtype=np.int16)  # Percentage distribution
+
+    return {
+        'trend_df': trend_df,
+        'crops': crops,
+        'regions': regions,
+        'avg_yields': avg_yields,
+        'crop_areas': crop_areas
+    }
+
+@st.cache_data
+def build_dashboard_figures(seed=DASHBOARD_SEED):
+    """Build the dashboard Plotly figures once per seed"""
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    data = get_dashboard_data(seed)
+
+    # WebGL keeps long line traces responsive; bar/pie charts stay on SVG
+    # since they only ever hold a handful of marks
+    trend_df = data['trend_df']
     fig = px.line(
         trend_df,
-        x='Date',
+        x=trend_df.index,
         y='Yield',
         color='Crop',
         title="Historical Yield Trends",
-        labels={'Yield': "Yield (tons/ha)", 'Date': "Date"}
+        labels={'Yield': "Yield (tons/ha)", 'Date': "Date"},
+        render_mode='webgl'
     )
 
     fig.update_layout(
         xaxis_title="Date",
         yaxis_title="Yield (tons/ha)",
-        hovermode='x unified'
+        # Unified hover scans every trace on each mouse move; only use it
+        # while the chart is small
+        hovermode='x unified' if len(trend_df) < UNIFIED_HOVER_MAX_POINTS else 'x',
+        spikedistance=-1
     )
+    fig.update_traces(hovertemplate='%{y:.2f}')
 
-    st.plotly_chart(fig, use_container_width=True)
-
-    # Regional performance
-    col1, col2 = st.columns(2)
-
-    with col1:
-        st.subheader("🌍 Regional Performance")
-
-        regions = ['North America', 'Europe', 'Asia', 'South America', 'Africa']
-        avg_yields = np.random.uniform(4, 9, len(regions))
-
-        fig_bar = px.bar(
-            x=regions,
-            y=avg_yields,
+    # The small bar/pie charts are built from graph objects directly to skip
+    # plotly.express wrapping a handful of values in a DataFrame
+    fig_bar = go.Figure(
+        data=[go.Bar(x=data['regions'], y=data['avg_yields'])],
+        layout=go.Layout(
             title="Average Yield by Region",
-            labels={'x': "Region", 'y': "Yield (tons/ha)"}
+            xaxis_title="Region",
+            yaxis_title="Yield (tons/ha)"
         )
+    )
 
-        st.plotly_chart(fig_bar, use_container_width=True)
+    fig_pie = go.Figure(
+        data=[go.Pie(labels=data['crops'], values=data['crop_areas'])],
+        layout=go.Layout(title="Crop Area Distribution")
+    )
 
-    with col2:
-        st.subheader("🌾 Crop Distribution")
+    return fig, fig_bar, fig_pie
+
+@st.cache_data
+def build_importance_figure(factors, importance):
+    """Build the feature importance chart; inputs are tuples so they hash"""
+    import plotly.express as px
 
-        crop_areas = [25, 30, 20, 25]  # Percentage distribution
+    # Sort ascending up front (horizontal bars stack bottom-up) so Plotly
+    # doesn't have to reorder the categories client-side
+    importance = np.asarray(importance, dtype=np.float32)
+    order = np.argsort(importance)
+
+    fig_importance = px.bar(
+        x=importance[order],
+        y=np.asarray(factors)[order],
+        orientation='h',
+        title="Factors Affecting Yield",
+        labels={'x': "Importance", 'y': "Factors"}
+    )
 
-        fig_pie = px.pie(
-            values=crop_areas,
-            names=crops,
-            title="Crop Area Distribution"
+    return fig_importance
+
+@st.cache_data
+def build_nutrient_figure(levels):
+    """Build the current vs optimal nutrient chart for a tuple of levels"""
+    import plotly.graph_objects as go
+
+    return go.Figure(
+        data=[
+            go.Bar(
+                name='Current Levels',
+                x=NUTRIENTS,
+                y=np.asarray(levels, dtype=np.float32),
+                marker_color='lightblue'
+            ),
+            go.Bar(
+                name='Optimal Levels',
+                x=NUTRIENTS,
+                y=OPTIMAL_NUTRIENTS,
+                marker_color='green',
+                opacity=0.6
+            )
+        ],
+        layout=go.Layout(
+            title="Current vs Optimal Nutrient Levels",
+            xaxis_title="Nutrients",
+            yaxis_title="Concentration (ppm)",
+            barmode='group'
         )
+    )
 
-        st.plotly_chart(fig_pie, use_container_width=True)
+@st.cache_data
+def build_suitability_figure(crops, suitability):
+    """Build the crop suitability chart; inputs are tuples so they hash"""
+    import plotly.express as px
+
+    suitability_df = pd.DataFrame({
+        'crop': crops,
+        'score': np.asarray(suitability, dtype=np.float32)
+    })
+
+    return px.bar(
+        suitability_df,
+        x='crop',
+        y='score',
+        title="Crop Suitability Scores",
+        labels={'crop': "Crops", 'score': "Suitability Score (%)"},
+        color='score',
+        color_continuous_scale='RdYlGn'
+    )
 
+# Input-heavy pages run as fragments so their widgets only rerun the page
+@st.fragment
 def show_prediction_page(crop_predictor, weather_service):
     st.header("🔮 Crop Yield Prediction")
 
     col1, col2 = st.columns([1, 2])
 
     with col1:
-        st.subheader("📝 Input Parameters")
-
-        # Crop selection
-        crop_type = st.selectbox(
-            "Select Crop Type",
-            options=['Wheat', 'Corn', 'Rice', 'Soybeans'],
-            help="Choose the crop you want to analyze"
-        )
+        # Inputs are batched in a form so widget changes only rerun on submit
+        with st.form('predict_form'):
+            st.subheader("📝 Input Parameters")
+
+            # Crop selection
+            crop_type = st.selectbox(
+                "Select Crop Type",
+                options=CROPS,
+                help="Choose the crop you want to analyze"
+            )
 
-        # Region input
-        region = st.text_input(
-            "Region / City",
-            placeholder="e.g., Iowa, USA",
-            help="Enter your farm location for weather data"
-        )
+            # Region input
+            region = st.text_input(
+                "Region / City",
+                placeholder="e.g., Iowa, USA",
+                help="Enter your farm location for weather data"
+            )
 
-        # Farm area
-        farm_area = st.number_input(
-            "Farm Area (ha)",
-            min_value=0.1,
-            max_value=10000.0,
-            value=10.0,
-            step=0.1,
-            help="Total area of your farm in hectares"
-        )
+            # Farm area
+            farm_area = st.number_input(
+                "Farm Area (ha)",
+                min_value=0.1,
+                max_value=10000.0,
+                value=10.0,
+                step=0.1,
+                help="Total area of your farm in hectares"
+            )
 
-        # Soil parameters
-        st.subheader("🌱 Soil Parameters")
+            # Soil parameters
+            st.subheader("🌱 Soil Parameters")
 
-        ph_level = st.slider(
-            "pH Level",
-            min_value=4.0,
-            max_value=9.0,
-            value=6.5,
-            step=0.1,
-            help="Soil acidity/alkalinity level (6.0-7.0 is optimal for most crops)"
-        )
+            ph_level = st.slider(
+                "pH Level",
+                min_value=4.0,
+                max_value=9.0,
+                value=6.5,
+                step=0.1,
+                help="Soil acidity/alkalinity level (6.0-7.0 is optimal for most crops)"
+            )
 
-        organic_matter = st.slider(
-            "Organic Matter (%)",
-            min_value=0.5,
-            max_value=10.0,
-            value=3.0,
-            step=0.1,
-            help="Percentage of organic matter in soil"
-        )
+            organic_matter = st.slider(
+                "Organic Matter (%)",
+                min_value=0.5,
+                max_value=10.0,
+                value=3.0,
+                step=0.1,
+                help="Percentage of organic matter in soil"
+            )
 
-        nitrogen = st.slider(
-            "Nitrogen (ppm)",
-            min_value=5,
-            max_value=100,
-            value=25,
-            step=1,
-            help="Nitrogen content in parts per million"
-        )
+            nitrogen = st.slider(
+                "Nitrogen (ppm)",
+                min_value=5,
+                max_value=100,
+                value=25,
+                step=1,
+                help="Nitrogen content in parts per million"
+            )
 
-        phosphorus = st.slider(
-            "Phosphorus (ppm)",
-            min_value=5,
-            max_value=100,
-            value=20,
-            step=1,
-            help="Phosphorus content in parts per million"
-        )
+            phosphorus = st.slider(
+                "Phosphorus (ppm)",
+                min_value=5,
+                max_value=100,
+                value=20,
+                step=1,
+                help="Phosphorus content in parts per million"
+            )
 
-        potassium = st.slider(
-            "Potassium (ppm)",
-            min_value=50,
-            max_value=500,
-            value=150,
-            step=10,
-            help="Potassium content in parts per million"
-        )
+            potassium = st.slider(
+                "Potassium (ppm)",
+                min_value=50,
+                max_value=500,
+                value=150,
+                step=10,
+                help="Potassium content in parts per million"
+            )
 
-        # Weather override option
-        st.subheader("🌤️ Weather Data")
-        use_current_weather = st.checkbox(
-            "Use Current Weather Data",
-            value=True,
-            help="Use real-time weather data for predictions"
-        )
+            # Weather override option
+            st.subheader("🌤️ Weather Data")
+            use_current_weather = st.checkbox(
+                "Use Current Weather Data",
+                value=True,
+                help="Use real-time weather data for predictions"
+            )
 
-        if not use_current_weather:
+            # Manual values are only used when current weather data is turned off;
+            # they are always rendered since widgets inside a form can't toggle live
             avg_temp = st.number_input(
                 "Average Temperature (°C)",
                 min_value=-10.0,
                 max_value=50.0,
                 value=22.0,
-                step=0.5
+                step=0.5,
+                help="Used when current weather data is not selected"
             )
 
             rainfall = st.number_input(
@@ -263,7 +472,8 @@ def show_prediction_page(crop_predictor, weather_service):
                 min_value=100,
                 max_value=3000,
                 value=800,
-                step=50
+                step=50,
+                help="Used when current weather data is not selected"
             )
 
             humidity = st.number_input(
@@ -271,19 +481,15 @@ def show_prediction_page(crop_predictor, weather_service):
                 min_value=20.0,
                 max_value=100.0,
                 value=65.0,
-                step=1.0
+                step=1.0,
+                help="Used when current weather data is not selected"
+            )
+
+            predict_button = st.form_submit_button(
+                "🔮 Predict Yield",
+                type="primary",
+                use_container_width=True
             )
-        else:
-            # Initialize default values for when using current weather
-            avg_temp = 22.0
-            rainfall = 800
-            humidity = 65.0
-
-        predict_button = st.button(
-            "🔮 Predict Yield",
-            type="primary",
-            use_container_width=True
-        )
 
     with col2:
         if predict_button:
@@ -291,97 +497,103 @@ def show_prediction_page(crop_predictor, weather_service):
                 st.error("Please enter a region/city")
                 return
 
-            with st.spinner("Analyzing..."):
-                try:
-                    # Get weather data if needed
-                    weather_data = None
-                    if use_current_weather:
-                        weather_data = weather_service.get_weather_data(region)
-                        if weather_data:
-                            avg_temp = weather_data['temperature']
-                            rainfall = weather_data.get('rainfall_annual', 800)
-                            humidity = weather_data['humidity']
-                        else:
-                            st.warning("Weather data unavailable, using default values")
-                            avg_temp, rainfall, humidity = 22.0, 800, 65.0
-
-                    # Prepare input data
-                    input_data = {
-                        'crop_type': crop_type,
-                        'ph_level': ph_level,
-                        'organic_matter': organic_matter,
-                        'nitrogen': nitrogen,
-                        'phosphorus': phosphorus,
-                        'potassium': potassium,
-                        'temperature': avg_temp,
-                        'rainfall': rainfall,
-                        'humidity': humidity,
-                        'farm_area': farm_area
-                    }
-
-                    # Make prediction
-                    prediction_result = crop_predictor.predict_yield(input_data)
-
-                    # Display results
-                    st.subheader("📊 Prediction Results")
-
-                    # Main prediction metrics
-                    col_metric1, col_metric2, col_metric3 = st.columns(3)
-
-                    with col_metric1:
-                        st.metric(
-                            label="Predicted Yield (tons/ha)",
-                            value=f"{prediction_result['yield_per_ha']:.2f}",
-                            help="Expected yield per hectare"
-                        )
+            # Report each stage as it finishes instead of one opaque spinner;
+            # the steps stay open while running and collapse once done
+            status = st.status("Analyzing...", expanded=True)
+            try:
+                # Get weather data if needed
+                weather_data = None
+                if use_current_weather:
+                    weather_data = weather_service.get_weather_data(region)
+                    if weather_data:
+                        avg_temp = weather_data['temperature']
+                        rainfall = weather_data.get('rainfall_annual', 800)
+                        humidity = weather_data['humidity']
+                        status.write(f"Weather fetched for {region}")
+                    else:
+                        st.warning("Weather data unavailable, using default values")
+                        avg_temp, rainfall, humidity = 22.0, 800, 65.0
+                        status.write("Weather unavailable, using default values")
+                else:
+                    status.write("Using the entered weather values")
 
-                    with col_metric2:
-                        st.metric(
-                            label="Total Yield (tons)",
-                            value=f"{prediction_result['total_yield']:.2f}",
-                            help="Total expected yield for your farm"
-                        )
+                status.update(label="Running yield model...")
 
-                    with col_metric3:
-                        st.metric(
-                            label="Confidence",
-                            value=f"{prediction_result['confidence']:.1%}",
-                            help="Model confidence in the prediction"
-                        )
+                # Prepare input data
+                input_data = {
+                    'crop_type': crop_type,
+                    'ph_level': ph_level,
+                    'organic_matter': organic_matter,
+                    'nitrogen': nitrogen,
+                    'phosphorus': phosphorus,
+                    'potassium': potassium,
+                    'temperature': avg_temp,
+                    'rainfall': rainfall,
+                    'humidity': humidity,
+                    'farm_area': farm_area
+                }
 
-                    # Risk assessment
-                    st.subheader("⚠️ Risk Assessment")
-                    risk_level = prediction_result['risk_level']
-                    risk_colors = {'Low': 'green', 'Medium': 'orange', 'High': 'red'}
-
-                    st.markdown(f"""
-                    <div style="padding: 10px; border-radius: 5px; background-color: {risk_colors[risk_level]}20; border-left: 5px solid {risk_colors[risk_level]};">
-                        <strong>Risk Level: {risk_level}</strong><br>
-                        {prediction_result['risk_factors']}
-                    </div>
-                    """, unsafe_allow_html=True)
-
-                    # Feature importance chart
-                    st.subheader("📈 Factor Importance")
-
-                    factors = list(prediction_result['feature_importance'].keys())
-                    importance = list(prediction_result['feature_importance'].values())
-
-                    fig_importance = px.bar(
-                        x=importance,
-                        y=factors,
-                        orientation='h',
-                        title="Factors Affecting Yield",
-                        labels={'x': "Importance", 'y': "Factors"}
+                # Make prediction
+                prediction_result = predict_crop_yield(crop_predictor, tuple(sorted(input_data.items())))
+
+                status.write(f"Model predicted {prediction_result['yield_per_ha']:.2f} tons/ha")
+                status.update(label="Rendering results...")
+
+                # Display results
+                st.subheader("📊 Prediction Results")
+
+                # Main prediction metrics
+                col_metric1, col_metric2, col_metric3 = st.columns(3)
+
+                with col_metric1:
+                    st.metric(
+                        label="Predicted Yield (tons/ha)",
+                        value=f"{prediction_result['yield_per_ha']:.2f}",
+                        help="Expected yield per hectare"
+                    )
+
+                with col_metric2:
+                    st.metric(
+                        label="Total Yield (tons)",
+                        value=f"{prediction_result['total_yield']:.2f}",
+                        help="Total expected yield for your farm"
                     )
-                    fig_importance.update_layout(yaxis={'categoryorder':'total ascending'})
 
-                    st.plotly_chart(fig_importance, use_container_width=True)
+                with col_metric3:
+                    st.metric(
+                        label="Confidence",
+                        value=f"{prediction_result['confidence']:.1%}",
+                        help="Model confidence in the prediction"
+                    )
+
+                # Risk assessment
+                st.subheader("⚠️ Risk Assessment")
+                risk_level = prediction_result['risk_level']
+                getattr(st, RISK_BANNERS[risk_level])(
+                    f"**Risk Level: {risk_level}**  \n{prediction_result['risk_factors']}"
+                )
+
+                # Feature importance chart
+                st.subheader("📈 Factor Importance")
+
+                feature_importance = prediction_result['feature_importance']
+                fig_importance = build_importance_figure(
+                    tuple(feature_importance.keys()),
+                    tuple(feature_importance.values())
+                )
+
+                st.plotly_chart(fig_importance, use_container_width=True, key='importance_fig')
 
-                except Exception as e:
-                    st.error(f"Prediction error: {str(e)}")
+                status.write("Charts built")
+                status.update(label="Analysis complete", state="complete", expanded=False)
+
+            except Exception as e:
+                status.update(label="Analysis failed", state="error")
+                st.error(f"Prediction error: {str(e)}")
 
 def show_weather_page(weather_service):
+    import plotly.graph_objects as go
+
     st.header("🌤️ Weather Monitoring")
 
     col1, col2 = st.columns([1, 2])
@@ -448,89 +660,125 @@ def show_weather_page(weather_service):
 
                     forecast_data = weather_service.get_forecast_data(location)
                     if forecast_data is not None and len(forecast_data) > 0:
-                        fig = px.line(
-                            forecast_data,
-                            x='date',
-                            y=['temperature', 'humidity'],
-                            title="7-Day Forecast",
-                            labels={'value': "Value", 'date': "Date"}
-                        )
-                        st.plotly_chart(fig, use_container_width=True)
+                        forecast_series = {
+                            column: downsample_series(forecast_data.set_index('date')[column])
+                            for column in ('temperature', 'humidity')
+                        }
+
+                        # Reuse the session's forecast figure and only swap its
+                        # trace data; the figure is built once per session
+                        fig = st.session_state.get('forecast_figure')
+                        if fig is None:
+                            # One WebGL trace per series, so the wide frame never
+                            # goes through plotly.express's melt
+                            fig = go.Figure(
+                                data=[
+                                    go.Scattergl(
+                                        x=series.index,
+                                        y=series.to_numpy(),
+                                        mode='lines',
+                                        name=column,
+                                        hovertemplate='%{y:.2f}'
+                                    )
+                                    for column, series in forecast_series.items()
+                                ],
+                                layout=go.Layout(
+                                    title="7-Day Forecast",
+                                    xaxis_title="Date",
+                                    yaxis_title="Value",
+                                    legend_title_text="variable",
+                                    hovermode='x',
+                                    spikedistance=-1
+                                )
+                            )
+                            st.session_state['forecast_figure'] = fig
+                        else:
+                            for column, series in forecast_series.items():
+                                fig.update_traces(
+                                    x=series.index,
+                                    y=series.to_numpy(),
+                                    selector={'name': column}
+                                )
+
+                        st.plotly_chart(fig, use_container_width=True, key='forecast_chart')
 
                 else:
                     st.error("Unable to retrieve weather data")
 
+@st.fragment
 def show_soil_analysis_page(data_processor):
     st.header("🌱 Soil Analysis")
 
     col1, col2 = st.columns([1, 2])
 
     with col1:
-        st.subheader("📝 Soil Test Results")
-
-        # Soil composition inputs
-        ph = st.number_input(
-            "pH Level",
-            min_value=4.0,
-            max_value=9.0,
-            value=6.5,
-            step=0.1,
-            help="Soil acidity/alkalinity level (6.0-7.0 is optimal for most crops)"
-        )
+        # Inputs are batched in a form so widget changes only rerun on submit
+        with st.form('soil_form'):
+            st.subheader("📝 Soil Test Results")
+
+            # Soil composition inputs
+            ph = st.number_input(
+                "pH Level",
+                min_value=4.0,
+                max_value=9.0,
+                value=6.5,
+                step=0.1,
+                help="Soil acidity/alkalinity level (6.0-7.0 is optimal for most crops)"
+            )
 
-        organic_matter = st.number_input(
-            "Organic Matter (%)",
-            min_value=0.0,
-            max_value=15.0,
-            value=3.0,
-            step=0.1
-        )
+            organic_matter = st.number_input(
+                "Organic Matter (%)",
+                min_value=0.0,
+                max_value=15.0,
+                value=3.0,
+                step=0.1
+            )
 
-        nitrogen = st.number_input(
-            "Nitrogen (ppm)",
-            min_value=0,
-            max_value=150,
-            value=25,
-            step=1
-        )
+            nitrogen = st.number_input(
+                "Nitrogen (ppm)",
+                min_value=0,
+                max_value=150,
+                value=25,
+                step=1
+            )
 
-        phosphorus = st.number_input(
-            "Phosphorus (ppm)",
-            min_value=0,
-            max_value=150,
-            value=20,
-            step=1
-        )
+            phosphorus = st.number_input(
+                "Phosphorus (ppm)",
+                min_value=0,
+                max_value=150,
+                value=20,
+                step=1
+            )
 
-        potassium = st.number_input(
-            "Potassium (ppm)",
-            min_value=0,
-            max_value=800,
-            value=150,
-            step=10
-        )
+            potassium = st.number_input(
+                "Potassium (ppm)",
+                min_value=0,
+                max_value=800,
+                value=150,
+                step=10
+            )
 
-        calcium = st.number_input(
-            "Calcium (ppm)",
-            min_value=100,
-            max_value=5000,
-            value=1200,
-            step=50
-        )
+            calcium = st.number_input(
+                "Calcium (ppm)",
+                min_value=100,
+                max_value=5000,
+                value=1200,
+                step=50
+            )
 
-        magnesium = st.number_input(
-            "Magnesium (ppm)",
-            min_value=25,
-            max_value=500,
-            value=120,
-            step=10
-        )
+            magnesium = st.number_input(
+                "Magnesium (ppm)",
+                min_value=25,
+                max_value=500,
+                value=120,
+                step=10
+            )
 
-        analyze_btn = st.button(
-            "🧪 Analyze Soil",
-            type="primary",
-            use_container_width=True
-        )
+            analyze_btn = st.form_submit_button(
+                "🧪 Analyze Soil",
+                type="primary",
+                use_container_width=True
+            )
 
     with col2:
         if analyze_btn:
@@ -559,33 +807,10 @@ def show_soil_analysis_page(data_processor):
                 # Nutrient levels visualization
                 st.subheader("📈 Nutrient Levels")
 
-                nutrients = ['Nitrogen', 'Phosphorus', 'Potassium', 'Calcium', 'Magnesium']
-                levels = [nitrogen, phosphorus, potassium, calcium, magnesium]
-                optimal = [40, 30, 200, 2000, 200]  # Optimal levels
-
-                fig_nutrients = go.Figure()
-                fig_nutrients.add_trace(go.Bar(
-                    name='Current Levels',
-                    x=nutrients,
-                    y=levels,
-                    marker_color='lightblue'
-                ))
-                fig_nutrients.add_trace(go.Bar(
-                    name='Optimal Levels',
-                    x=nutrients,
-                    y=optimal,
-                    marker_color='green',
-                    opacity=0.6
-                ))
-
-                fig_nutrients.update_layout(
-                    title="Current vs Optimal Nutrient Levels",
-                    xaxis_title="Nutrients",
-                    yaxis_title="Concentration (ppm)",
-                    barmode='group'
-                )
+                levels = (nitrogen, phosphorus, potassium, calcium, magnesium)
+                fig_nutrients = build_nutrient_figure(levels)
 
-                st.plotly_chart(fig_nutrients, use_container_width=True)
+                st.plotly_chart(fig_nutrients, use_container_width=True, key='nutrient_fig')
 
                 # Recommendations
                 st.subheader("💡 Recommendations")
@@ -596,20 +821,14 @@ def show_soil_analysis_page(data_processor):
                 st.subheader("🌾 Crop Suitability")
                 suitability_data = analysis_result['crop_suitability']
 
-                crops = list(suitability_data.keys())
-                suitability = list(suitability_data.values())
-
-                fig_suitability = px.bar(
-                    x=crops,
-                    y=suitability,
-                    title="Crop Suitability Scores",
-                    labels={'x': "Crops", 'y': "Suitability Score (%)"},
-                    color=suitability,
-                    color_continuous_scale='RdYlGn'
+                fig_suitability = build_suitability_figure(
+                    tuple(suitability_data.keys()),
+                    tuple(suitability_data.values())
                 )
 
-                st.plotly_chart(fig_suitability, use_container_width=True)
+                st.plotly_chart(fig_suitability, use_container_width=True, key='suitability_fig')
 
+@st.fragment
 def show_recommendations_page(recommendation_engine):
     st.header("💡 Recommendations")
 
@@ -680,9 +899,11 @@ def show_recommendations_page(recommendation_engine):
 
                 for i, crop_rec in enumerate(crop_recs):
                     with st.expander(f"{i+1}. {crop_rec['crop']} - Expected Profit: ${crop_rec['expected_profit']:,}"):
-                        st.write(f"**Rationale:** {crop_rec['rationale']}")
-                        st.write(f"**Investment Required:** ${crop_rec['investment']:,}")
-                        st.write(f"**Risk Level:** {crop_rec['risk_level']}")
+                        st.markdown(
+                            f"**Rationale:** {crop_rec['rationale']}\n\n"
+                            f"**Investment Required:** ${crop_rec['investment']:,}\n\n"
+                            f"**Risk Level:** {crop_rec['risk_level']}"
+                        )
 
                 # Technology recommendations
                 st.subheader("🔧 Technology Recommendations")
@@ -690,8 +911,10 @@ def show_recommendations_page(recommendation_engine):
 
                 for tech in tech_recs:
                     with st.expander(f"{tech['technology']} - Cost: ${tech['cost']:,}"):
-                        st.write(f"**Description:** {tech['description']}")
-                        st.write(f"**ROI:** {tech['roi']}")
+                        st.markdown(
+                            f"**Description:** {tech['description']}\n\n"
+                            f"**ROI:** {tech['roi']}"
+                        )
 
                 # Best practices
                 st.subheader("📋 Best Practices")
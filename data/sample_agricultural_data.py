@@ -2,6 +2,20 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 
+CROP_TYPES = ['Wheat', 'Corn', 'Rice', 'Soybeans']
+
+# Optimal growing conditions, indexed by position in CROP_TYPES
+OPTIMAL_PH = np.array([6.5, 6.2, 5.8, 6.8])
+OPTIMAL_NUTRIENTS = np.array([  # N, P, K (lower N for soybeans due to fixation)
+    [35, 25, 150],
+    [50, 30, 180],
+    [30, 20, 130],
+    [20, 25, 160]
+])
+OPTIMAL_TEMP = np.array([20, 25, 30, 23])
+OPTIMAL_RAINFALL = np.array([600, 900, 1500, 750])
+OPTIMAL_HUMIDITY = np.array([60, 70, 80, 65])
+
 def get_agricultural_data():
     """
     Generate comprehensive agricultural training data for crop yield prediction models
@@ -10,29 +24,34 @@ def get_agricultural_data():
         pandas.DataFrame: Training dataset with soil, weather, and yield data
     """
     
-    # Set random seed for reproducibility
-    np.random.seed(42)
+    # Seed for reproducibility; each crop draws from its own child stream
+    seed_sequence = np.random.SeedSequence(42)
+    rng = np.random.default_rng(seed_sequence)
+    crop_rngs = [np.random.default_rng(seed) for seed in seed_sequence.spawn(len(CROP_TYPES))]
     
     # Number of samples per crop
     samples_per_crop = 1000
-    crops = ['Wheat', 'Corn', 'Rice', 'Soybeans']
-    
-    all_data = []
+    crops = CROP_TYPES
     
-    for crop in crops:
-        crop_data = _generate_crop_data(crop, samples_per_crop)
-        all_data.extend(crop_data)
+    crop_data = [
+        _generate_crop_data(crop, samples_per_crop, crop_rng)
+        for crop, crop_rng in zip(crops, crop_rngs)
+    ]
     
-    # Create DataFrame
-    df = pd.DataFrame(all_data)
+    # Create DataFrame once from the concatenated per-crop columns
+    df = pd.DataFrame({
+        column: np.concatenate([data[column] for data in crop_data])
+        for column in crop_data[0]
+    })
+    df['crop_type'] = df['crop_type'].astype(pd.CategoricalDtype(CROP_TYPES))
     
     # Add some realistic correlations and adjustments
-    df = _apply_realistic_correlations(df)
+    df = _apply_realistic_correlations(df, rng)
     
     return df
 
-def _generate_crop_data(crop_type, num_samples):
-    """Generate data for a specific crop type"""
+def _generate_crop_data(crop_type, num_samples, rng):
+    """Generate data for a specific crop type as a dict of column arrays"""
     
     # Crop-specific parameter ranges based on agricultural research
     crop_parameters = {
@@ -87,207 +106,182 @@ def _generate_crop_data(crop_type, num_samples):
     }
     
     params = crop_parameters[crop_type]
-    data = []
-    
-    for i in range(num_samples):
-        # Generate soil parameters
-        ph = np.random.uniform(*params['ph_range'])
-        organic_matter = np.random.gamma(2, 1.5) + params['organic_matter_range'][0]
-        organic_matter = min(organic_matter, params['organic_matter_range'][1])
-        
-        nitrogen = np.random.gamma(3, params['nitrogen_range'][1]/6)
-        nitrogen = np.clip(nitrogen, *params['nitrogen_range'])
-        
-        phosphorus = np.random.gamma(2.5, params['phosphorus_range'][1]/5)
-        phosphorus = np.clip(phosphorus, *params['phosphorus_range'])
-        
-        potassium = np.random.gamma(4, params['potassium_range'][1]/8)
-        potassium = np.clip(potassium, *params['potassium_range'])
-        
-        # Generate weather parameters
-        temperature = np.random.normal(
-            (params['temperature_range'][0] + params['temperature_range'][1]) / 2,
-            (params['temperature_range'][1] - params['temperature_range'][0]) / 6
-        )
-        temperature = np.clip(temperature, *params['temperature_range'])
-        
-        rainfall = np.random.gamma(2, params['rainfall_range'][1]/4)
-        rainfall = np.clip(rainfall, *params['rainfall_range'])
-        
-        humidity = np.random.normal(
-            (params['humidity_range'][0] + params['humidity_range'][1]) / 2,
-            (params['humidity_range'][1] - params['humidity_range'][0]) / 6
-        )
-        humidity = np.clip(humidity, *params['humidity_range'])
-        
-        # Calculate yield based on parameters with realistic relationships
-        yield_tons_per_ha = _calculate_realistic_yield(
-            crop_type, ph, organic_matter, nitrogen, phosphorus, potassium,
-            temperature, rainfall, humidity, params
-        )
-        
-        # Add some random variation
-        yield_tons_per_ha += np.random.normal(0, params['yield_variance'] * 0.2)
-        yield_tons_per_ha = max(0.5, yield_tons_per_ha)  # Minimum realistic yield
-        
-        data.append({
-            'crop_type': crop_type,
-            'ph_level': round(ph, 2),
-            'organic_matter': round(organic_matter, 2),
-            'nitrogen': round(nitrogen, 1),
-            'phosphorus': round(phosphorus, 1),
-            'potassium': round(potassium, 1),
-            'temperature': round(temperature, 1),
-            'rainfall': round(rainfall, 0),
-            'humidity': round(humidity, 1),
-            'yield_tons_per_ha': round(yield_tons_per_ha, 2)
-        })
-    
-    return data
-
-def _calculate_realistic_yield(crop_type, ph, organic_matter, nitrogen, phosphorus, 
-                              potassium, temperature, rainfall, humidity, params):
-    """Calculate realistic yield based on agricultural science principles"""
-    
-    base_yield = params['base_yield']
     
-    # pH effect on yield (each crop has optimal pH range)
-    optimal_ph = {
-        'Wheat': 6.5,
-        'Corn': 6.2,
-        'Rice': 5.8,
-        'Soybeans': 6.8
+    # Generate soil parameters
+    ph = rng.uniform(*params['ph_range'], size=num_samples)
+    organic_matter = rng.gamma(2, 1.5, size=num_samples) + params['organic_matter_range'][0]
+    np.minimum(organic_matter, params['organic_matter_range'][1], out=organic_matter)
+    
+    nitrogen = rng.gamma(3, params['nitrogen_range'][1]/6, size=num_samples)
+    np.clip(nitrogen, *params['nitrogen_range'], out=nitrogen)
+    
+    phosphorus = rng.gamma(2.5, params['phosphorus_range'][1]/5, size=num_samples)
+    np.clip(phosphorus, *params['phosphorus_range'], out=phosphorus)
+    
+    potassium = rng.gamma(4, params['potassium_range'][1]/8, size=num_samples)
+    np.clip(potassium, *params['potassium_range'], out=potassium)
+    
+    # Generate weather parameters
+    temperature = rng.normal(
+        (params['temperature_range'][0] + params['temperature_range'][1]) / 2,
+        (params['temperature_range'][1] - params['temperature_range'][0]) / 6,
+        size=num_samples
+    )
+    np.clip(temperature, *params['temperature_range'], out=temperature)
+    
+    rainfall = rng.gamma(2, params['rainfall_range'][1]/4, size=num_samples)
+    np.clip(rainfall, *params['rainfall_range'], out=rainfall)
+    
+    humidity = rng.normal(
+        (params['humidity_range'][0] + params['humidity_range'][1]) / 2,
+        (params['humidity_range'][1] - params['humidity_range'][0]) / 6,
+        size=num_samples
+    )
+    np.clip(humidity, *params['humidity_range'], out=humidity)
+    
+    # Calculate yield based on parameters with realistic relationships
+    yield_tons_per_ha = _calculate_realistic_yield(
+        CROP_TYPES.index(crop_type), ph, organic_matter, nitrogen, phosphorus, potassium,
+        temperature, rainfall, humidity, params['base_yield']
+    )
+    
+    # Add some random variation
+    yield_tons_per_ha += rng.normal(0, params['yield_variance'] * 0.2, size=num_samples)
+    np.maximum(yield_tons_per_ha, 0.5, out=yield_tons_per_ha)  # Minimum realistic yield
+    
+    return {
+        'crop_type': np.full(num_samples, crop_type, dtype=object),
+        'ph_level': np.round(ph, 2, out=ph),
+        'organic_matter': np.round(organic_matter, 2, out=organic_matter),
+        'nitrogen': np.round(nitrogen, 1, out=nitrogen),
+        'phosphorus': np.round(phosphorus, 1, out=phosphorus),
+        'potassium': np.round(potassium, 1, out=potassium),
+        'temperature': np.round(temperature, 1, out=temperature),
+        'rainfall': np.round(rainfall, 0, out=rainfall),
+        'humidity': np.round(humidity, 1, out=humidity),
+        'yield_tons_per_ha': np.round(yield_tons_per_ha, 2, out=yield_tons_per_ha)
     }
+
+def _calculate_realistic_yield(crop_id, ph, organic_matter, nitrogen, phosphorus,
+                              potassium, temperature, rainfall, humidity, base_yield):
+    """Calculate realistic yields for arrays of samples based on agricultural science principles"""
     
-    ph_optimal = optimal_ph[crop_type]
-    ph_effect = 1.0 - (abs(ph - ph_optimal) * 0.15)  # 15% yield loss per pH unit deviation
-    ph_effect = max(0.3, ph_effect)  # Minimum 30% of base yield
+    # pH effect on yield (each crop has optimal pH range)
+    ph_effect = 1.0 - (np.abs(ph - OPTIMAL_PH[crop_id]) * 0.15)  # 15% yield loss per pH unit deviation
+    np.maximum(ph_effect, 0.3, out=ph_effect)  # Minimum 30% of base yield
     
     # Organic matter effect (generally positive)
     om_effect = 0.8 + (organic_matter / 10.0)  # Base 80% + bonus from OM
-    om_effect = min(1.3, om_effect)  # Cap at 130%
+    np.minimum(om_effect, 1.3, out=om_effect)  # Cap at 130%
     
     # Nutrient effects (Liebig's law - limited by most deficient nutrient)
-    optimal_nutrients = {
-        'Wheat': {'N': 35, 'P': 25, 'K': 150},
-        'Corn': {'N': 50, 'P': 30, 'K': 180},
-        'Rice': {'N': 30, 'P': 20, 'K': 130},
-        'Soybeans': {'N': 20, 'P': 25, 'K': 160}  # Lower N due to fixation
-    }
-    
-    crop_nutrients = optimal_nutrients[crop_type]
+    n_optimal, p_optimal, k_optimal = OPTIMAL_NUTRIENTS[crop_id].T
     
-    n_effect = min(1.0, nitrogen / crop_nutrients['N'])
-    p_effect = min(1.0, phosphorus / crop_nutrients['P'])
-    k_effect = min(1.0, potassium / crop_nutrients['K'])
+    n_effect = np.minimum(1.0, nitrogen / n_optimal)
+    p_effect = np.minimum(1.0, phosphorus / p_optimal)
+    k_effect = np.minimum(1.0, potassium / k_optimal)
     
     # Limiting nutrient effect (Liebig's law)
-    nutrient_effect = min(n_effect, p_effect, k_effect)
-    nutrient_effect = max(0.2, nutrient_effect)  # Minimum 20%
+    nutrient_effect = np.minimum.reduce([n_effect, p_effect, k_effect])
+    np.maximum(nutrient_effect, 0.2, out=nutrient_effect)  # Minimum 20%
     
     # Temperature effect (each crop has optimal range)
-    optimal_temp = {
-        'Wheat': 20,
-        'Corn': 25,
-        'Rice': 30,
-        'Soybeans': 23
-    }
-    
-    temp_optimal = optimal_temp[crop_type]
-    temp_deviation = abs(temperature - temp_optimal)
+    temp_optimal = OPTIMAL_TEMP[crop_id]
+    temp_deviation = np.abs(temperature - temp_optimal)
     temp_effect = 1.0 - (temp_deviation * 0.03)  # 3% loss per degree deviation
-    temp_effect = max(0.4, temp_effect)  # Minimum 40%
-    
-    # Rainfall effect (crop-specific water needs)
-    optimal_rainfall = {
-        'Wheat': 600,
-        'Corn': 900,
-        'Rice': 1500,
-        'Soybeans': 750
-    }
-    
-    rain_optimal = optimal_rainfall[crop_type]
-    if rainfall < rain_optimal:
-        rain_effect = rainfall / rain_optimal
-    else:
-        # Excess rainfall can also reduce yield
-        excess = rainfall - rain_optimal
-        rain_effect = 1.0 - (excess / rain_optimal * 0.3)
+    np.maximum(temp_effect, 0.4, out=temp_effect)  # Minimum 40%
     
-    rain_effect = max(0.3, min(1.2, rain_effect))
+    # Rainfall effect (crop-specific water needs); excess rainfall can also reduce yield
+    rain_optimal = OPTIMAL_RAINFALL[crop_id]
+    rain_effect = np.where(
+        rainfall < rain_optimal,
+        rainfall / rain_optimal,
+        1.0 - ((rainfall - rain_optimal) / rain_optimal * 0.3)
+    )
+    np.clip(rain_effect, 0.3, 1.2, out=rain_effect)
     
     # Humidity effect (moderate impact)
-    optimal_humidity = {
-        'Wheat': 60,
-        'Corn': 70,
-        'Rice': 80,
-        'Soybeans': 65
-    }
-    
-    hum_optimal = optimal_humidity[crop_type]
-    hum_deviation = abs(humidity - hum_optimal)
+    hum_optimal = OPTIMAL_HUMIDITY[crop_id]
+    hum_deviation = np.abs(humidity - hum_optimal)
     hum_effect = 1.0 - (hum_deviation * 0.01)  # 1% loss per % deviation
-    hum_effect = max(0.7, hum_effect)  # Minimum 70%
+    np.maximum(hum_effect, 0.7, out=hum_effect)  # Minimum 70%
     
-    # Calculate final yield
-    final_yield = (base_yield * ph_effect * om_effect * nutrient_effect * 
-                   temp_effect * rain_effect * hum_effect)
+    # Calculate final yield, accumulating into one buffer
+    final_yield = base_yield * ph_effect
+    for effect in (om_effect, nutrient_effect, temp_effect, rain_effect, hum_effect):
+        final_yield *= effect
     
     # Add some interaction effects
     # High temperature + low humidity = stress
-    if temperature > temp_optimal + 5 and humidity < hum_optimal - 10:
-        final_yield *= 0.85  # 15% stress penalty
+    stress = (temperature > temp_optimal + 5) & (humidity < hum_optimal - 10)
+    final_yield[stress] *= 0.85  # 15% stress penalty
     
     # Good conditions synergy
-    if (ph_effect > 0.9 and nutrient_effect > 0.8 and temp_effect > 0.9 and 
-        rain_effect > 0.9):
-        final_yield *= 1.1  # 10% synergy bonus
+    synergy = ((ph_effect > 0.9) & (nutrient_effect > 0.8) & (temp_effect > 0.9) &
+               (rain_effect > 0.9))
+    final_yield[synergy] *= 1.1  # 10% synergy bonus
     
     return final_yield
 
-def _apply_realistic_correlations(df):
+def _apply_realistic_correlations(df, rng):
     """Apply realistic correlations between parameters"""
     
-    # Add some realistic correlations
-    for crop in df['crop_type'].unique():
-        crop_mask = df['crop_type'] == crop
-        crop_data = df[crop_mask].copy()
-        
-        # Higher organic matter often correlates with higher nitrogen
-        high_om_mask = crop_data['organic_matter'] > crop_data['organic_matter'].median()
-        df.loc[crop_mask & high_om_mask, 'nitrogen'] *= np.random.uniform(1.05, 1.2, sum(crop_mask & high_om_mask))
-        
-        # Temperature and humidity often inversely related
-        high_temp_mask = crop_data['temperature'] > crop_data['temperature'].median()
-        df.loc[crop_mask & high_temp_mask, 'humidity'] *= np.random.uniform(0.85, 0.95, sum(crop_mask & high_temp_mask))
-        
-        # Regions with high rainfall often have different soil characteristics
-        high_rain_mask = crop_data['rainfall'] > crop_data['rainfall'].median()
-        df.loc[crop_mask & high_rain_mask, 'potassium'] *= np.random.uniform(0.9, 1.1, sum(crop_mask & high_rain_mask))
+    # Per-crop medians broadcast back to every row
+    medians = df.groupby('crop_type', observed=True)[
+        ['organic_matter', 'temperature', 'rainfall']
+    ].transform('median')
+    
+    # Higher organic matter often correlates with higher nitrogen;
+    # temperature and humidity often inversely related;
+    # regions with high rainfall often have different soil characteristics
+    adjustments = [
+        ('organic_matter', 'nitrogen', 1.05, 1.2),
+        ('temperature', 'humidity', 0.85, 0.95),
+        ('rainfall', 'potassium', 0.9, 1.1)
+    ]
+    
+    adjusted = {}
+    for driver, target, low, high in adjustments:
+        mask = (df[driver] > medians[driver]).to_numpy()
+        values = df[target].to_numpy(copy=True)
+        values[mask] *= rng.uniform(low, high, mask.sum())
+        adjusted[target] = values
+    
+    # Write the adjusted columns back in a single assignment
+    df = df.assign(**adjusted)
     
     # Ensure all values are within reasonable bounds after adjustments
-    df['ph_level'] = np.clip(df['ph_level'], 4.0, 9.0)
-    df['organic_matter'] = np.clip(df['organic_matter'], 0.5, 10.0)
-    df['nitrogen'] = np.clip(df['nitrogen'], 5, 100)
-    df['phosphorus'] = np.clip(df['phosphorus'], 5, 100)
-    df['potassium'] = np.clip(df['potassium'], 50, 500)
-    df['temperature'] = np.clip(df['temperature'], 5, 45)
-    df['rainfall'] = np.clip(df['rainfall'], 200, 3000)
-    df['humidity'] = np.clip(df['humidity'], 20, 100)
-    df['yield_tons_per_ha'] = np.clip(df['yield_tons_per_ha'], 0.5, 15.0)
+    bounds = {
+        'ph_level': (4.0, 9.0),
+        'organic_matter': (0.5, 10.0),
+        'nitrogen': (5, 100),
+        'phosphorus': (5, 100),
+        'potassium': (50, 500),
+        'temperature': (5, 45),
+        'rainfall': (200, 3000),
+        'humidity': (20, 100),
+        'yield_tons_per_ha': (0.5, 15.0)
+    }
+    columns = list(bounds)
+    lower, upper = np.array(list(bounds.values())).T
+    df[columns] = np.clip(df[columns].to_numpy(), lower, upper)
     
     return df
 
-def get_historical_yield_data():
+def get_historical_yield_data(rng=None):
     """
     Generate historical yield trend data for visualization
     
+    Args:
+        rng (numpy.random.Generator, optional): Random generator to draw from
+    
     Returns:
         pandas.DataFrame: Historical yield data by year and crop
     """
     
-    years = range(2015, 2025)
-    crops = ['Wheat', 'Corn', 'Rice', 'Soybeans']
+    rng = rng or np.random.default_rng()
+    years = np.arange(2015, 2025)
+    crops = CROP_TYPES
     
     # Base yields (global averages in tons/hectare)
     base_yields = {
@@ -305,42 +299,43 @@ def get_historical_yield_data():
         'Soybeans': 0.025 # 2.5% annual improvement
     }
     
-    historical_data = []
-    
-    for crop in crops:
-        base_yield = base_yields[crop]
-        trend = trends[crop]
-        
-        for i, year in enumerate(years):
-            # Calculate yield with trend and some random variation
-            year_yield = base_yield * (1 + trend) ** i
-            year_yield += np.random.normal(0, base_yield * 0.1)  # 10% random variation
-            year_yield = max(year_yield * 0.5, year_yield)  # Minimum threshold
-            
-            historical_data.append({
-                'year': year,
-                'crop': crop,
-                'yield_tons_per_ha': round(year_yield, 2),
-                'area_harvested_million_ha': np.random.uniform(50, 200),  # Mock area data
-                'production_million_tons': round(year_yield * np.random.uniform(50, 200), 1)
-            })
-    
-    return pd.DataFrame(historical_data)
+    n_years, n_crops = len(years), len(crops)
+    num_rows = n_years * n_crops
+    base_yield = np.repeat([base_yields[crop] for crop in crops], n_years)
+    trend = np.repeat([trends[crop] for crop in crops], n_years)
+    year_index = np.tile(np.arange(n_years), n_crops)
+    
+    # Calculate yield with trend and some random variation
+    year_yield = base_yield * (1 + trend) ** year_index
+    year_yield += rng.normal(0, base_yield * 0.1)  # 10% random variation
+    year_yield = np.maximum(0.5, year_yield)  # Minimum realistic yield
+    
+    return pd.DataFrame({
+        'year': np.tile(years, n_crops),
+        'crop': np.repeat(crops, n_years),
+        'yield_tons_per_ha': np.round(year_yield, 2),
+        'area_harvested_million_ha': rng.uniform(50, 200, size=num_rows),  # Mock area data
+        'production_million_tons': np.round(year_yield * rng.uniform(50, 200, size=num_rows), 1)
+    })
 
-def get_regional_yield_data():
+def get_regional_yield_data(rng=None):
     """
     Generate regional yield comparison data
     
+    Args:
+        rng (numpy.random.Generator, optional): Random generator to draw from
+    
     Returns:
         pandas.DataFrame: Regional yield data
     """
     
+    rng = rng or np.random.default_rng()
     regions = [
         'North America', 'Europe', 'Asia', 'South America', 
         'Africa', 'Oceania'
     ]
     
-    crops = ['Wheat', 'Corn', 'Rice', 'Soybeans']
+    crops = CROP_TYPES
     
     # Regional yield factors (relative to global average)
     regional_factors = {
@@ -359,27 +354,22 @@ def get_regional_yield_data():
         'Soybeans': 2.8
     }
     
-    regional_data = []
-    
-    for region in regions:
-        for crop in crops:
-            base_yield = base_yields[crop]
-            factor = regional_factors[region][crop]
-            regional_yield = base_yield * factor
-            
-            # Add some variation
-            regional_yield += np.random.normal(0, regional_yield * 0.05)
-            regional_yield = max(0.5, regional_yield)
-            
-            regional_data.append({
-                'region': region,
-                'crop': crop,
-                'avg_yield_tons_per_ha': round(regional_yield, 2),
-                'climate_suitability': np.random.choice(['Excellent', 'Good', 'Fair', 'Poor']),
-                'technology_adoption': np.random.uniform(0.3, 0.9)
-            })
-    
-    return pd.DataFrame(regional_data)
+    n_regions, n_crops = len(regions), len(crops)
+    num_rows = n_regions * n_crops
+    factor = np.array([[regional_factors[region][crop] for crop in crops] for region in regions]).ravel()
+    regional_yield = np.tile([base_yields[crop] for crop in crops], n_regions) * factor
+    
+    # Add some variation
+    regional_yield += rng.normal(0, regional_yield * 0.05)
+    regional_yield = np.maximum(0.5, regional_yield)
+    
+    return pd.DataFrame({
+        'region': np.repeat(regions, n_crops),
+        'crop': np.tile(crops, n_regions),
+        'avg_yield_tons_per_ha': np.round(regional_yield, 2),
+        'climate_suitability': rng.choice(['Excellent', 'Good', 'Fair', 'Poor'], size=num_rows),
+        'technology_adoption': rng.uniform(0.3, 0.9, size=num_rows)
+    })
 
 # For testing purposes
 if __name__ == "__main__":
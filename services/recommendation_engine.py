@@ -1,11 +1,95 @@
-import numpy as np
-import pandas as pd
-from datetime import datetime, timedelta
-import random
+from datetime import datetime
+from functools import lru_cache
+from types import MappingProxyType
+
+# Base irrigation recommendations by growth stage
+STAGE_IRRIGATION = {
+    'Seedling': {
+        'action': 'Light, frequent watering to maintain soil moisture',
+        'timing': 'Daily light irrigation or every 2-3 days',
+        'priority': 'High',
+        'reason': 'Critical establishment phase requiring consistent moisture'
+    },
+    'Vegetative': {
+        'action': 'Deep, less frequent watering to encourage root development',
+        'timing': 'Every 3-5 days depending on soil type and weather',
+        'priority': 'Medium',
+        'reason': 'Building strong root system and vegetative growth'
+    },
+    'Flowering': {
+        'action': 'Consistent moisture critical for flower and fruit development',
+        'timing': 'Monitor soil moisture daily, irrigate as needed',
+        'priority': 'High',
+        'reason': 'Water stress during flowering significantly impacts yield'
+    },
+    'Maturity': {
+        'action': 'Reduce irrigation to prevent quality issues and prepare for harvest',
+        'timing': 'Minimal irrigation, only if severe drought conditions',
+        'priority': 'Low',
+        'reason': 'Excess moisture can delay harvest and reduce grain quality'
+    }
+}
+
+# Fertilizer application timing and priority by growth stage
+FERTILIZER_TIMING = {
+    'Seedling': 'At planting or within 2 weeks of emergence',
+    'Vegetative': 'Every 3-4 weeks during active growth',
+    'Flowering': 'At flower initiation and early flowering',
+    'Maturity': 'Final application before grain filling'
+}
+FERTILIZER_PRIORITY = {
+    'Seedling': 'High',
+    'Vegetative': 'High',
+    'Flowering': 'Medium',
+    'Maturity': 'Low'
+}
+
+# Seasonal irrigation advice
+SUMMER_IRRIGATION_DETAILS = (
+    'Increase irrigation frequency during hot summer months',
+    'Consider early morning irrigation to reduce evaporation',
+    'Monitor for signs of heat stress',
+    'Mulch around plants to retain soil moisture'
+)
+WINTER_IRRIGATION_DETAILS = (
+    'Reduce irrigation frequency in cooler weather',
+    'Avoid overwatering in low evaporation conditions',
+    'Check drainage to prevent waterlogging',
+    'Monitor soil temperature before irrigating'
+)
+DEFAULT_IRRIGATION_DETAILS = (
+    'Monitor weather forecasts before scheduling irrigation',
+    'Check soil moisture at 6-inch depth before watering',
+    'Adjust timing based on recent rainfall',
+    'Maintain consistent moisture levels'
+)
+
+# Month-indexed lookups (January first)
+IRRIGATION_DETAILS_BY_MONTH = (
+    WINTER_IRRIGATION_DETAILS, WINTER_IRRIGATION_DETAILS,
+    DEFAULT_IRRIGATION_DETAILS, DEFAULT_IRRIGATION_DETAILS, DEFAULT_IRRIGATION_DETAILS,
+    SUMMER_IRRIGATION_DETAILS, SUMMER_IRRIGATION_DETAILS, SUMMER_IRRIGATION_DETAILS,
+    DEFAULT_IRRIGATION_DETAILS, DEFAULT_IRRIGATION_DETAILS, DEFAULT_IRRIGATION_DETAILS,
+    WINTER_IRRIGATION_DETAILS
+)
+# High during the growing season, Medium in transition periods
+PEST_RISK_BY_MONTH = (
+    'Low', 'Low', 'Medium', 'Medium', 'High', 'High',
+    'High', 'High', 'High', 'Medium', 'Low', 'Low'
+)
+
+def _freeze(value):
+    """Recursively turn dicts into read-only mappings and lists into tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
 
 class RecommendationEngine:
     def __init__(self):
-        self.crop_data = {
+        # Static crop knowledge base; frozen because the templates below are built from it
+        self.crop_data = _freeze({
             'Wheat': {
                 'growth_stages': ['Seedling', 'Vegetative', 'Flowering', 'Maturity'],
                 'growing_season': {'start': 'October', 'end': 'June'},
@@ -74,88 +158,144 @@ class RecommendationEngine:
                     'soil_ph': (6.0, 7.0)
                 }
             }
-        }
+        })
+        
+        # Stage-specific recommendations depend only on crop and growth stage,
+        # so build them once for every known combination
+        self._irrigation_templates = {}
+        self._fert_templates = {}
+        self._pest_templates = {}
+        self._harvest_templates = {}
+        self._weekly_schedules = {}
+        for crop_type, crop_info in self.crop_data.items():
+            for growth_stage in crop_info['growth_stages']:
+                key = (crop_type, growth_stage)
+                self._irrigation_templates[key] = self._build_irrigation_recommendations(crop_type, growth_stage)
+                self._fert_templates[key] = self._build_fertilization_recommendations(crop_type, growth_stage)
+                self._pest_templates[key] = self._build_pest_control_recommendations(crop_type, growth_stage)
+                self._harvest_templates[key] = self._build_harvesting_recommendations(crop_type, growth_stage)
+                self._weekly_schedules[key] = self._build_weekly_schedule(crop_type, growth_stage)
+        
+        # Recommendations are a pure function of crop, stage and month; region
+        # never affects the result, so it stays out of the key. The cache is
+        # per engine so it never outlives the instance
+        self._cached_recommendations = lru_cache(maxsize=1024)(self._build_recommendations)
     
-    def generate_recommendations(self, farm_data):
+    def generate_recommendations(self, farm_data, readonly=False):
         """
         Generate comprehensive recommendations based on farm data
         
         Args:
             farm_data (dict): Current farm status including crop, stage, location, etc.
+            readonly (bool): Return the shared cached result as a read-only mapping
+                (with tuple details) instead of a private mutable copy
             
         Returns:
             dict: Categorized recommendations
         """
         
+        cached = self._cached_recommendations(*self._recommendation_key(farm_data))
+        return cached if readonly else self._copy_recommendations(cached)
+    
+    def generate_recommendations_batch(self, farms, readonly=False):
+        """
+        Generate recommendations for several farms, building each distinct case once
+        
+        Args:
+            farms (list): Farm data dictionaries as accepted by generate_recommendations
+            readonly (bool): Return shared read-only results, as in generate_recommendations
+            
+        Returns:
+            list: Categorized recommendations in the same order as farms
+        """
+        
+        results = {}
+        recommendations = []
+        
+        for farm_data in farms:
+            key = self._recommendation_key(farm_data)
+            if key not in results:
+                results[key] = self._cached_recommendations(*key)
+            recommendations.append(
+                results[key] if readonly else self._copy_recommendations(results[key])
+            )
+        
+        return recommendations
+    
+    def _recommendation_key(self, farm_data):
+        """Reduce farm data to the (crop, stage, month) inputs recommendations depend on"""
+        
         crop_type = farm_data.get('crop_type', 'Wheat')
         growth_stage = farm_data.get('growth_stage', 'Vegetative')
-        current_date = farm_data.get('current_date', datetime.now())
-        region = farm_data.get('region', 'Unknown')
+        
+        # Only the month is used; read the clock only when no date was given
+        current_date = farm_data.get('current_date')
+        month = current_date.month if current_date is not None else datetime.now().month
         
         if crop_type not in self.crop_data:
             crop_type = 'Wheat'  # Default fallback
         
-        crop_info = self.crop_data[crop_type]
+        return crop_type, growth_stage, month
+    
+    def _copy_recommendations(self, recommendations):
+        """Copy cached recommendations so callers can modify their own result"""
+        # Every category is a read-only mapping of strings plus a details tuple;
+        # mappingproxy.copy() returns a plain dict copy of the underlying mapping
+        copies = {}
+        for category, recommendation in recommendations.items():
+            copies[category] = recommendation.copy()
+            copies[category]['details'] = list(recommendation['details'])
+        return copies
+    
+    def _build_recommendations(self, crop_type, growth_stage, month):
+        """Build all recommendation categories for one crop, stage and month"""
         
         recommendations = {}
         
         # Irrigation recommendations
         recommendations['irrigation'] = self._generate_irrigation_recommendations(
-            crop_type, growth_stage, current_date, region
+            crop_type, growth_stage, month
         )
         
         # Fertilization recommendations
         recommendations['fertilization'] = self._generate_fertilization_recommendations(
-            crop_type, growth_stage, current_date
+            crop_type, growth_stage, month
         )
         
         # Pest control recommendations
         recommendations['pest_control'] = self._generate_pest_control_recommendations(
-            crop_type, growth_stage, current_date
+            crop_type, growth_stage, month
         )
         
         # Harvesting recommendations
         recommendations['harvesting'] = self._generate_harvesting_recommendations(
-            crop_type, growth_stage, current_date
+            crop_type, growth_stage, month
         )
         
-        return recommendations
+        # Frozen so the cached result can be shared with read-only callers
+        return _freeze(recommendations)
     
-    def _generate_irrigation_recommendations(self, crop_type, growth_stage, current_date, region):
+    def _generate_irrigation_recommendations(self, crop_type, growth_stage, month):
         """Generate irrigation-specific recommendations"""
         
+        template = self._irrigation_templates.get((crop_type, growth_stage))
+        if template is None:
+            template = self._build_irrigation_recommendations(crop_type, growth_stage)
+        
+        base_rec = dict(template)
+        
+        # Add seasonal adjustments
+        base_rec['details'] = list(IRRIGATION_DETAILS_BY_MONTH[month - 1])
+        
+        return base_rec
+    
+    def _build_irrigation_recommendations(self, crop_type, growth_stage):
+        """Build the stage irrigation recommendation adjusted for the crop's water needs"""
+        
         crop_info = self.crop_data[crop_type]
         water_needs = crop_info['water_needs']
         
-        # Base recommendations by growth stage
-        stage_recommendations = {
-            'Seedling': {
-                'action': 'Light, frequent watering to maintain soil moisture',
-                'timing': 'Daily light irrigation or every 2-3 days',
-                'priority': 'High',
-                'reason': 'Critical establishment phase requiring consistent moisture'
-            },
-            'Vegetative': {
-                'action': 'Deep, less frequent watering to encourage root development',
-                'timing': 'Every 3-5 days depending on soil type and weather',
-                'priority': 'Medium',
-                'reason': 'Building strong root system and vegetative growth'
-            },
-            'Flowering': {
-                'action': 'Consistent moisture critical for flower and fruit development',
-                'timing': 'Monitor soil moisture daily, irrigate as needed',
-                'priority': 'High',
-                'reason': 'Water stress during flowering significantly impacts yield'
-            },
-            'Maturity': {
-                'action': 'Reduce irrigation to prevent quality issues and prepare for harvest',
-                'timing': 'Minimal irrigation, only if severe drought conditions',
-                'priority': 'Low',
-                'reason': 'Excess moisture can delay harvest and reduce grain quality'
-            }
-        }
-        
-        base_rec = stage_recommendations.get(growth_stage, stage_recommendations['Vegetative'])
+        base_rec = STAGE_IRRIGATION.get(growth_stage, STAGE_IRRIGATION['Vegetative']).copy()
         
         # Adjust based on crop water needs
         if water_needs == 'Very High':
@@ -167,35 +307,18 @@ class RecommendationEngine:
             if base_rec['priority'] == 'High':
                 base_rec['priority'] = 'Medium'
         
-        # Add seasonal adjustments
-        month = current_date.month
-        if month in [6, 7, 8]:  # Summer months
-            base_rec['details'] = [
-                'Increase irrigation frequency during hot summer months',
-                'Consider early morning irrigation to reduce evaporation',
-                'Monitor for signs of heat stress',
-                'Mulch around plants to retain soil moisture'
-            ]
-        elif month in [12, 1, 2]:  # Winter months
-            base_rec['details'] = [
-                'Reduce irrigation frequency in cooler weather',
-                'Avoid overwatering in low evaporation conditions',
-                'Check drainage to prevent waterlogging',
-                'Monitor soil temperature before irrigating'
-            ]
-        else:
-            base_rec['details'] = [
-                'Monitor weather forecasts before scheduling irrigation',
-                'Check soil moisture at 6-inch depth before watering',
-                'Adjust timing based on recent rainfall',
-                'Maintain consistent moisture levels'
-            ]
-        
         return base_rec
     
-    def _generate_fertilization_recommendations(self, crop_type, growth_stage, current_date):
+    def _generate_fertilization_recommendations(self, crop_type, growth_stage, month):
         """Generate fertilization recommendations"""
         
+        return self._copy_template(
+            self._fert_templates, self._build_fertilization_recommendations, crop_type, growth_stage
+        )
+    
+    def _build_fertilization_recommendations(self, crop_type, growth_stage):
+        """Build the fertilization recommendation for a crop and growth stage"""
+        
         crop_info = self.crop_data[crop_type]
         fertilizer_schedule = crop_info['fertilizer_schedule']
         
@@ -204,8 +327,8 @@ class RecommendationEngine:
         # Base recommendation structure
         recommendation = {
             'action': f'Apply {", ".join(stage_fertilizers)} suitable for {growth_stage.lower()} stage',
-            'timing': self._get_fertilizer_timing(growth_stage),
-            'priority': self._get_fertilizer_priority(growth_stage),
+            'timing': FERTILIZER_TIMING.get(growth_stage, 'As needed based on soil tests'),
+            'priority': FERTILIZER_PRIORITY.get(growth_stage, 'Medium'),
             'reason': f'{growth_stage} stage requires specific nutrients for optimal development'
         }
         
@@ -245,28 +368,33 @@ class RecommendationEngine:
         
         return recommendation
     
-    def _generate_pest_control_recommendations(self, crop_type, growth_stage, current_date):
+    def _generate_pest_control_recommendations(self, crop_type, growth_stage, month):
         """Generate pest control recommendations"""
         
-        crop_info = self.crop_data[crop_type]
-        common_pests = crop_info['common_pests']
+        template = self._pest_templates.get((crop_type, growth_stage))
+        if template is None:
+            template = self._build_pest_control_recommendations(crop_type, growth_stage)
         
         # Seasonal pest pressure
-        month = current_date.month
-        seasonal_risk = 'Medium'
+        seasonal_risk = PEST_RISK_BY_MONTH[month - 1]
+        
+        return {
+            'action': template['action'],
+            'timing': template['timing'],
+            'priority': seasonal_risk,
+            'reason': f'Seasonal pest pressure is {seasonal_risk.lower()} for this time of year',
+            'details': list(template['details'])
+        }
+    
+    def _build_pest_control_recommendations(self, crop_type, growth_stage):
+        """Build the season-independent parts of the pest control recommendation"""
         
-        if month in [5, 6, 7, 8, 9]:  # Growing season
-            seasonal_risk = 'High'
-        elif month in [3, 4, 10]:  # Transition periods
-            seasonal_risk = 'Medium'
-        else:
-            seasonal_risk = 'Low'
+        crop_info = self.crop_data[crop_type]
+        common_pests = crop_info['common_pests']
         
         recommendation = {
             'action': f'Monitor for {", ".join(common_pests[:2])} and other common pests',
-            'timing': 'Weekly scouting recommended during growing season',
-            'priority': seasonal_risk,
-            'reason': f'Seasonal pest pressure is {seasonal_risk.lower()} for this time of year'
+            'timing': 'Weekly scouting recommended during growing season'
         }
         
         # Stage-specific recommendations
@@ -308,9 +436,16 @@ class RecommendationEngine:
         
         return recommendation
     
-    def _generate_harvesting_recommendations(self, crop_type, growth_stage, current_date):
+    def _generate_harvesting_recommendations(self, crop_type, growth_stage, month):
         """Generate harvesting recommendations"""
         
+        return self._copy_template(
+            self._harvest_templates, self._build_harvesting_recommendations, crop_type, growth_stage
+        )
+    
+    def _build_harvesting_recommendations(self, crop_type, growth_stage):
+        """Build the harvesting recommendation for a crop and growth stage"""
+        
         if growth_stage != 'Maturity':
             return {
                 'action': f'Continue monitoring crop development - not ready for harvest',
@@ -378,29 +513,28 @@ class RecommendationEngine:
         
         return recommendation
     
-    def _get_fertilizer_timing(self, growth_stage):
-        """Get fertilizer application timing"""
-        timing_map = {
-            'Seedling': 'At planting or within 2 weeks of emergence',
-            'Vegetative': 'Every 3-4 weeks during active growth',
-            'Flowering': 'At flower initiation and early flowering',
-            'Maturity': 'Final application before grain filling'
-        }
-        return timing_map.get(growth_stage, 'As needed based on soil tests')
-    
-    def _get_fertilizer_priority(self, growth_stage):
-        """Get fertilizer priority level"""
-        priority_map = {
-            'Seedling': 'High',
-            'Vegetative': 'High',
-            'Flowering': 'Medium',
-            'Maturity': 'Low'
-        }
-        return priority_map.get(growth_stage, 'Medium')
+    def _copy_template(self, templates, build, crop_type, growth_stage):
+        """Copy a precomputed recommendation, building it for growth stages outside the table"""
+        template = templates.get((crop_type, growth_stage))
+        if template is None:
+            return build(crop_type, growth_stage)
+        
+        recommendation = dict(template)
+        recommendation['details'] = list(template['details'])
+        return recommendation
     
     def generate_weekly_schedule(self, crop_type, growth_stage):
         """Generate a weekly task schedule"""
         
+        schedule = self._weekly_schedules.get((crop_type, growth_stage))
+        if schedule is None:
+            return self._build_weekly_schedule(crop_type, growth_stage)
+        
+        return {day: list(tasks) for day, tasks in schedule.items()}
+    
+    def _build_weekly_schedule(self, crop_type, growth_stage):
+        """Distribute a growth stage's tasks across the week"""
+        
         days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
         schedule = {day: [] for day in days}
         
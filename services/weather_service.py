@@ -1,15 +1,81 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime
 import json
 
+# How long a successful API response is reused before it is fetched again
+WEATHER_CACHE_TTL = 300  # seconds
+FORECAST_CACHE_TTL = 3600  # seconds
+# Locations are free text, so each cache keeps at most this many entries
+RESPONSE_CACHE_MAX_ENTRIES = 256
+
+# Forecast values stay well within float32 precision, which halves the
+# size of the numeric forecast columns
+FORECAST_DTYPE = np.float32
+
+# Optimal (temp_min, temp_max, humidity_min, humidity_max) for each crop
+OPTIMAL_CONDITIONS = {
+    'Wheat': (15, 25, 50, 70),
+    'Corn': (20, 30, 60, 80),
+    'Rice': (25, 35, 70, 90),
+    'Soybeans': (20, 28, 55, 75)
+}
+DEFAULT_CONDITIONS = (15, 30, 50, 80)
+
+# The same ranges as a (crops x 4) array for batch assessment
+CONDITION_CROPS = list(OPTIMAL_CONDITIONS)
+CONDITION_BOUNDS = np.array(list(OPTIMAL_CONDITIONS.values()), dtype=float)
+IMPACT_LABELS = np.array(['Favorable', 'Moderate', 'Unfavorable'])
+
+# Annual rainfall range (mm) for locations naming one of the keywords,
+# checked in order; anywhere else falls back to DEFAULT_RAINFALL
+RAINFALL_CLASSES = (
+    (('desert', 'arizona', 'nevada'), (100, 400)),
+    (('tropical', 'florida', 'hawaii'), (1200, 2500)),
+    (('seattle', 'oregon', 'washington'), (800, 1500))
+)
+DEFAULT_RAINFALL = (500, 1200)
+
 class WeatherService:
     def __init__(self):
         self.api_key = os.getenv("OPENWEATHER_API_KEY", "your_api_key_here")
         self.base_url = "http://api.openweathermap.org/data/2.5"
+        # Responses keyed by location / (location, days), stored as
+        # (time.monotonic() deadline, result)
+        self._weather_cache = {}
+        self._forecast_cache = {}
+        self._cache_lock = threading.Lock()
+        
+        # Generator used for all mock and estimated values
+        self._rng = np.random.default_rng()
         
+        # One pooled session so repeat calls reuse keep-alive connections;
+        # transient gateway errors are retried briefly before giving up
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=2,
+                backoff_factor=0.2,
+                status_forcelist=[502, 503, 504],
+                raise_on_status=False
+            )
+        )
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+    
+    def close(self):
+        """Close the pooled HTTP connections"""
+        self._session.close()
+    
     def get_weather_data(self, location):
         """
         Get current weather data for a location
@@ -20,6 +86,11 @@ class WeatherService:
         Returns:
             dict: Weather data or None if error
         """
+        now = time.monotonic()
+        cached = self._cache_get(self._weather_cache, location, now)
+        if cached is not None:
+            return dict(cached)
+        
         try:
             # Current weather endpoint
             url = f"{self.base_url}/weather"
@@ -29,12 +100,12 @@ class WeatherService:
                 'units': 'metric'
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self._session.get(url, params=params, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
                 
-                return {
+                result = {
                     'location': data['name'],
                     'country': data['sys']['country'],
                     'temperature': data['main']['temp'],
@@ -49,6 +120,8 @@ class WeatherService:
                     'rainfall_annual': self._estimate_annual_rainfall(location),
                     'timestamp': datetime.now()
                 }
+                self._cache_put(self._weather_cache, location, result, now + WEATHER_CACHE_TTL)
+                return dict(result)
             else:
                 print(f"Weather API error: {response.status_code}")
                 return None
@@ -72,6 +145,12 @@ class WeatherService:
         Returns:
             pandas.DataFrame: Forecast data
         """
+        now = time.monotonic()
+        key = (location, days)
+        cached = self._cache_get(self._forecast_cache, key, now)
+        if cached is not None:
+            return cached.copy()
+        
         try:
             url = f"{self.base_url}/forecast"
             params = {
@@ -80,23 +159,39 @@ class WeatherService:
                 'units': 'metric'
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self._session.get(url, params=params, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
-                forecast_data = []
+                items = data['list'][:days * 8]  # 8 forecasts per day (3-hour intervals)
                 
-                for item in data['list'][:days * 8]:  # 8 forecasts per day (3-hour intervals)
-                    forecast_data.append({
-                        'date': datetime.fromtimestamp(item['dt']),
-                        'temperature': item['main']['temp'],
-                        'humidity': item['main']['humidity'],
-                        'description': item['weather'][0]['description'],
-                        'wind_speed': item['wind']['speed'],
-                        'precipitation': item.get('rain', {}).get('3h', 0)
-                    })
+                # Collect each column in one pass and build the frame from
+                # columns, so pandas does not transpose a list of row dicts
+                dates = []
+                temperatures = []
+                humidities = []
+                descriptions = []
+                wind_speeds = []
+                precipitation = []
                 
-                return pd.DataFrame(forecast_data)
+                for item in items:
+                    dates.append(datetime.fromtimestamp(item['dt']))
+                    temperatures.append(item['main']['temp'])
+                    humidities.append(item['main']['humidity'])
+                    descriptions.append(item['weather'][0]['description'])
+                    wind_speeds.append(item['wind']['speed'])
+                    precipitation.append(item.get('rain', {}).get('3h', 0))
+                
+                result = pd.DataFrame({
+                    'date': dates,
+                    'temperature': np.asarray(temperatures, dtype=FORECAST_DTYPE),
+                    'humidity': np.asarray(humidities, dtype=FORECAST_DTYPE),
+                    'description': descriptions,
+                    'wind_speed': np.asarray(wind_speeds, dtype=FORECAST_DTYPE),
+                    'precipitation': np.asarray(precipitation, dtype=FORECAST_DTYPE)
+                })
+                self._cache_put(self._forecast_cache, key, result, now + FORECAST_CACHE_TTL)
+                return result.copy()
             else:
                 print(f"Forecast API error: {response.status_code}")
                 return self._get_mock_forecast_data(location, days)
@@ -105,49 +200,91 @@ class WeatherService:
             print(f"Forecast service error: {e}")
             return self._get_mock_forecast_data(location, days)
     
+    def _cache_get(self, cache, key, now):
+        """Return the cached response for key, or None if missing or expired"""
+        entry = cache.get(key)
+        if entry and now < entry[0]:
+            return entry[1]
+        return None
+    
+    def _cache_put(self, cache, key, value, expires_at):
+        """Store a response, evicting expired entries and then the oldest ones"""
+        now = time.monotonic()
+        with self._cache_lock:
+            for stale in [k for k, (deadline, _) in cache.items() if deadline <= now]:
+                del cache[stale]
+            
+            # Re-inserting moves the key to the end, so the first key is the oldest
+            cache.pop(key, None)
+            while len(cache) >= RESPONSE_CACHE_MAX_ENTRIES:
+                del cache[next(iter(cache))]
+            
+            cache[key] = (expires_at, value)
+    
+    def get_weather_data_batch(self, locations, max_workers=8):
+        """
+        Get current weather for several locations, fetching them concurrently
+        
+        Args:
+            locations (list): City names or coordinates
+            max_workers (int): Maximum number of requests in flight at once
+            
+        Returns:
+            list: Weather data (or None) in the same order as locations
+        """
+        
+        unique = list(dict.fromkeys(locations))
+        if not unique:
+            return []
+        
+        # Each lookup is network-bound, so threads sharing the pooled session
+        # overlap the round-trips; repeated locations are fetched once
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(unique))) as executor:
+            results = dict(zip(unique, executor.map(self.get_weather_data, unique)))
+        
+        return [results[location] for location in locations]
+    
     def _get_mock_weather_data(self, location):
         """Return mock weather data for development/testing"""
         
         # Generate realistic weather data based on location patterns
-        base_temp = np.random.uniform(15, 30)
+        base_temp = self._rng.uniform(15, 30)
         
         return {
             'location': location.split(',')[0] if ',' in location else location,
             'country': 'Mock',
             'temperature': base_temp,
-            'feels_like': base_temp + np.random.uniform(-2, 2),
-            'humidity': np.random.uniform(40, 80),
-            'pressure': np.random.uniform(1000, 1020),
-            'description': np.random.choice(['clear sky', 'few clouds', 'scattered clouds', 'light rain']),
-            'wind_speed': np.random.uniform(2, 8),
-            'wind_direction': np.random.uniform(0, 360),
-            'visibility': np.random.uniform(8, 15),
-            'uv_index': np.random.uniform(3, 9),
-            'rainfall_annual': np.random.uniform(400, 1200),
+            'feels_like': base_temp + self._rng.uniform(-2, 2),
+            'humidity': self._rng.uniform(40, 80),
+            'pressure': self._rng.uniform(1000, 1020),
+            'description': self._rng.choice(['clear sky', 'few clouds', 'scattered clouds', 'light rain']),
+            'wind_speed': self._rng.uniform(2, 8),
+            'wind_direction': self._rng.uniform(0, 360),
+            'visibility': self._rng.uniform(8, 15),
+            'uv_index': self._rng.uniform(3, 9),
+            'rainfall_annual': self._rng.uniform(400, 1200),
             'timestamp': datetime.now()
         }
     
     def _get_mock_forecast_data(self, location, days):
         """Return mock forecast data"""
         
-        forecast_data = []
-        start_date = datetime.now()
-        base_temp = np.random.uniform(15, 30)
+        n = days * 4  # 4 forecasts per day
+        i = np.arange(n)
+        base_temp = self._rng.uniform(15, 30)
         
-        for i in range(days * 4):  # 4 forecasts per day
-            date = start_date + timedelta(hours=i * 6)
-            temp_variation = np.sin(i * 0.1) * 5  # Temperature variation pattern
-            
-            forecast_data.append({
-                'date': date,
-                'temperature': base_temp + temp_variation + np.random.uniform(-2, 2),
-                'humidity': np.random.uniform(40, 80),
-                'description': np.random.choice(['clear sky', 'few clouds', 'light rain']),
-                'wind_speed': np.random.uniform(2, 8),
-                'precipitation': np.random.uniform(0, 5) if np.random.random() < 0.3 else 0
-            })
-        
-        return pd.DataFrame(forecast_data)
+        # Draw every column in one call instead of one draw per forecast step
+        temp_variation = np.sin(i * 0.1) * 5  # Temperature variation pattern
+        rain_draws = self._rng.uniform(0, 5, n)
+        
+        return pd.DataFrame({
+            'date': pd.date_range(datetime.now(), periods=n, freq='6h'),
+            'temperature': (base_temp + temp_variation + self._rng.uniform(-2, 2, n)).astype(FORECAST_DTYPE),
+            'humidity': self._rng.uniform(40, 80, n).astype(FORECAST_DTYPE),
+            'description': self._rng.choice(['clear sky', 'few clouds', 'light rain'], n),
+            'wind_speed': self._rng.uniform(2, 8, n).astype(FORECAST_DTYPE),
+            'precipitation': np.where(self._rng.random(n) < 0.3, rain_draws, 0.0).astype(FORECAST_DTYPE)
+        })
     
     def _estimate_uv_index(self, latitude):
         """Estimate UV index based on latitude"""
@@ -155,11 +292,11 @@ class WeatherService:
         # Simple estimation based on latitude
         abs_lat = abs(latitude)
         if abs_lat < 23.5:  # Tropics
-            return np.random.uniform(8, 12)
+            return self._rng.uniform(8, 12)
         elif abs_lat < 40:  # Subtropical
-            return np.random.uniform(6, 9)
+            return self._rng.uniform(6, 9)
         else:  # Temperate
-            return np.random.uniform(3, 7)
+            return self._rng.uniform(3, 7)
     
     def _estimate_annual_rainfall(self, location):
         """Estimate annual rainfall based on location"""
@@ -167,14 +304,12 @@ class WeatherService:
         # Very basic estimation - in reality, this would use historical data
         location_lower = location.lower()
         
-        if any(region in location_lower for region in ['desert', 'arizona', 'nevada']):
-            return np.random.uniform(100, 400)
-        elif any(region in location_lower for region in ['tropical', 'florida', 'hawaii']):
-            return np.random.uniform(1200, 2500)
-        elif any(region in location_lower for region in ['seattle', 'oregon', 'washington']):
-            return np.random.uniform(800, 1500)
-        else:
-            return np.random.uniform(500, 1200)
+        for keywords, (low, high) in RAINFALL_CLASSES:
+            for keyword in keywords:
+                if keyword in location_lower:
+                    return self._rng.uniform(low, high)
+        
+        return self._rng.uniform(*DEFAULT_RAINFALL)
     
     def assess_agricultural_impact(self, weather_data):
         """
@@ -202,21 +337,37 @@ class WeatherService:
         
         return impact_assessment
     
+    def assess_agricultural_impact_batch(self, weather_df):
+        """
+        Assess the overall weather impact on each crop for many weather readings
+        
+        Args:
+            weather_df (pandas.DataFrame): Rows with 'temperature' and 'humidity'
+            
+        Returns:
+            pandas.DataFrame: Overall impact per row (index) and crop (columns),
+            matching the 'impact' of assess_agricultural_impact
+        """
+        
+        temperature = weather_df['temperature'].to_numpy(dtype=float)[:, None]
+        humidity = weather_df['humidity'].to_numpy(dtype=float)[:, None]
+        temp_min, temp_max, hum_min, hum_max = CONDITION_BOUNDS.T
+        
+        # Every (row, crop) pair is compared at once by broadcasting
+        temp_optimal = (temperature >= temp_min) & (temperature <= temp_max)
+        temp_poor = (temperature < temp_min - 5) | (temperature > temp_max + 5)
+        hum_good = (humidity >= hum_min) & (humidity <= hum_max)
+        
+        codes = np.select([temp_poor, temp_optimal & hum_good], [2, 0], default=1)
+        
+        return pd.DataFrame(IMPACT_LABELS[codes], index=weather_df.index, columns=CONDITION_CROPS)
+    
     def _assess_crop_weather_impact(self, crop, temperature, humidity, description):
         """Assess weather impact for specific crop"""
         
-        # Optimal conditions for each crop
-        optimal_conditions = {
-            'Wheat': {'temp_range': (15, 25), 'humidity_range': (50, 70)},
-            'Corn': {'temp_range': (20, 30), 'humidity_range': (60, 80)},
-            'Rice': {'temp_range': (25, 35), 'humidity_range': (70, 90)},
-            'Soybeans': {'temp_range': (20, 28), 'humidity_range': (55, 75)}
-        }
-        
-        crop_conditions = optimal_conditions.get(crop, {'temp_range': (15, 30), 'humidity_range': (50, 80)})
+        temp_min, temp_max, hum_min, hum_max = OPTIMAL_CONDITIONS.get(crop, DEFAULT_CONDITIONS)
         
         # Assess temperature impact
-        temp_min, temp_max = crop_conditions['temp_range']
         if temp_min <= temperature <= temp_max:
             temp_impact = "Optimal"
         elif temperature < temp_min - 5 or temperature > temp_max + 5:
@@ -225,7 +376,6 @@ class WeatherService:
             temp_impact = "Suboptimal"
         
         # Assess humidity impact
-        hum_min, hum_max = crop_conditions['humidity_range']
         if hum_min <= humidity <= hum_max:
             hum_impact = "Good"
         else: